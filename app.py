@@ -1,7 +1,11 @@
 # app.py
+import hashlib
 import os
 import shutil
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import faiss
 import streamlit as st
 
 from ingestation.ingest_pdf import PDFIngestor
@@ -33,16 +37,78 @@ UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 DIR = "embeddings"
 
+# Only images and audio are re-read later by the query tab (st.image /
+# st.audio); everything else is read exactly once by its extractor, so
+# it can live on a RAM-backed tmpfs where one exists.
+TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else UPLOAD_DIR
+PERSISTED_EXTS = ("png", "jpg", "jpeg", "wav", "mp3")
+
+
+def _ingest_one(safe_path: str, ext: str):
+    """
+    Extract text from a single saved upload. Runs in a worker process,
+    so it must stay a top-level (picklable) function.
+    Returns (filename, text, file_type).
+    """
+    name = os.path.basename(safe_path)
+    if ext == "pdf":
+        text = PDFIngestor(UPLOAD_DIR).extract_text_from_pdf(safe_path)
+        ftype = "pdf"
+    elif ext == "docx":
+        text = DOCXIngestor(UPLOAD_DIR).extract_text_from_docx(safe_path)
+        ftype = "docx"
+    elif ext in ["png", "jpg", "jpeg"]:
+        text = ImageIngestor(UPLOAD_DIR).extract_text_from_image(safe_path)
+        ftype = "image"
+    elif ext in ["wav", "mp3"]:
+        text = AudioIngestor(UPLOAD_DIR).transcribe_audio(safe_path)
+        ftype = "audio"
+    elif ext == "pptx":
+        text = PPTXIngestor(UPLOAD_DIR).extract_text_from_pptx(safe_path)
+        ftype = "pptx"
+    elif ext in ["xls", "xlsx"]:
+        text = ExcelIngestor(UPLOAD_DIR).extract_text_from_excel(safe_path)
+        ftype = "excel"
+    else:
+        raise ValueError(f"Unsupported file type: {name}")
+    return name, text, ftype
+
 # --------------------------------------
 # Initialize Session State
 # --------------------------------------
 if "ingested_files" not in st.session_state:
     st.session_state["ingested_files"] = []
+if "ingested_hashes" not in st.session_state:
+    st.session_state["ingested_hashes"] = {}  # content digest -> original filename
 
 # --------------------------------------
-# Instantiate Vector Store
+# Instantiate Vector Store / LLM (heavy singletons, cached across reruns)
 # --------------------------------------
-vs = VectorStore()
+@st.cache_resource
+def get_vector_store() -> VectorStore:
+    store = VectorStore()
+    store.warmup()  # pay model-load/kernel-init once at startup, not on the first query
+    return store
+
+
+@st.cache_resource
+def get_llm() -> OllamaInference:
+    return OllamaInference(model_name="phi:2.7b")
+
+
+# Queries whose embedding is this close (cosine) to a cached one reuse
+# the cached answer instead of re-running Ollama.
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+
+@st.cache_resource
+def get_semantic_cache():
+    """In-memory semantic answer cache: FAISS index over normalized query
+    embeddings plus a parallel list of answers."""
+    return {"index": None, "answers": []}
+
+
+vs = get_vector_store()
 
 # --------------------------------------
 # Create Tabs
@@ -60,24 +126,25 @@ with tab1:
 
     if st.button("🗑 Clear All Data (index + embeddings)"):
         try:
-            vs_tmp = VectorStore()
-            vs_tmp.clear()
+            vs.clear()
+            get_vector_store.clear()  # drop the cached instance so the next rerun starts fresh
+            # Cached answers were generated from the deleted documents;
+            # a near-duplicate query must not resurrect them.
+            get_semantic_cache.clear()
         except Exception:
             logging.exception("Error clearing vector store (continuing).")
 
         if os.path.exists(DIR):
-            for filename in os.listdir(DIR):
-                file_path = os.path.join(DIR, filename)
-                try:
-                    if os.path.isfile(file_path) or os.path.islink(file_path):
-                        os.chmod(file_path, 0o777)
-                        os.remove(file_path)
-                    elif os.path.isdir(file_path):
-                        shutil.rmtree(file_path, ignore_errors=True)
-                except Exception:
-                    logging.exception(f"Failed to delete {file_path}, continuing.")
+            # One rmtree walks the whole tree in C; the onerror hook covers
+            # read-only entries (the old per-file chmod dance, Windows case).
+            shutil.rmtree(
+                DIR,
+                onerror=lambda fn, path, exc: (os.chmod(path, 0o777), fn(path)),
+            )
+        os.makedirs(DIR, exist_ok=True)
 
         st.session_state["ingested_files"] = []
+        st.session_state["ingested_hashes"] = {}
         st.success("Cleared vector store and embeddings. Start from scratch!")
         st.rerun()
 
@@ -96,46 +163,94 @@ with tab1:
 
         if new_files:
             all_docs = {}
+
+            # Write uploads to disk synchronously (fast), then fan the
+            # CPU-bound extraction/transcription out to worker processes.
+            to_ingest = []
+            # Digests are only promoted into session state once a file is
+            # extracted AND indexed, so a failed or empty run can be
+            # retried by re-uploading instead of being treated as a
+            # duplicate of itself.
+            batch_digests = {}  # filename -> content digest for this batch
             for upload in new_files:
-                safe_path = os.path.join(UPLOAD_DIR, upload.name)
-                with open(safe_path, "wb") as out:
-                    out.write(upload.getbuffer())
+                # Dedup by content, not just filename: a re-upload under a
+                # new name shouldn't trigger a full re-ingest. hashlib uses
+                # SHA-NI hardware hashing where available, so this check is
+                # negligible next to extraction.
+                h = hashlib.sha256()
+                upload.seek(0)
+                for block in iter(lambda: upload.read(1 << 20), b""):
+                    h.update(block)
+                digest = h.hexdigest()
+                known = st.session_state["ingested_hashes"].get(digest)
+                if known is None:
+                    known = next(
+                        (n for n, d in batch_digests.items() if d == digest), None
+                    )
+                if known is not None:
+                    st.info(f"Skipping {upload.name}: duplicate of {known}")
+                    continue
+                batch_digests[upload.name] = digest
 
                 ext = upload.name.split(".")[-1].lower()
-                try:
-                    if ext == "pdf":
-                        text = PDFIngestor(UPLOAD_DIR).extract_text_from_pdf(safe_path)
-                        ftype = "pdf"
-                    elif ext == "docx":
-                        text = DOCXIngestor(UPLOAD_DIR).extract_text_from_docx(safe_path)
-                        ftype = "docx"
-                    elif ext in ["png", "jpg", "jpeg"]:
-                        text = ImageIngestor(UPLOAD_DIR).extract_text_from_image(safe_path)
-                        ftype = "image"
-                    elif ext in ["wav", "mp3"]:
-                        text = AudioIngestor(UPLOAD_DIR).transcribe_audio(safe_path)
-                        ftype = "audio"
-                    elif ext == "pptx":
-                        text = PPTXIngestor(UPLOAD_DIR).extract_text_from_pptx(safe_path)
-                        ftype = "pptx"
-                    elif ext in ["xls", "xlsx"]:
-                        text = ExcelIngestor(UPLOAD_DIR).extract_text_from_excel(safe_path)
-                        ftype = "excel"
-                    else:
-                        st.warning(f"Unsupported file type: {upload.name}")
-                        continue
-
-                    if text and text.strip():
-                        all_docs[upload.name] = {"text": text, "file_type": ftype}
-                        logging.info(f"Ingested {upload.name} -> {len(text)} chars")
-                    else:
-                        st.warning(f"No text extracted from {upload.name}. Skipping ingestion.")
-
-                except Exception as e:
-                    st.error(f"Failed to ingest {upload.name}: {e}")
+                dirn = UPLOAD_DIR if ext in PERSISTED_EXTS else TMP_DIR
+                safe_path = os.path.join(dirn, upload.name)
+                # Bounded 1MB streaming copy instead of materializing the
+                # whole upload via getbuffer(); the extractor reads the
+                # file from disk once, so drop it from the page cache too.
+                upload.seek(0)
+                with open(safe_path, "wb") as out:
+                    shutil.copyfileobj(upload, out, length=1024 * 1024)
+                    if hasattr(os, "posix_fadvise"):
+                        out.flush()
+                        os.posix_fadvise(out.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+                to_ingest.append((upload.name, safe_path, ext))
+
+            if to_ingest:
+                max_workers = min(len(to_ingest), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=max_workers) as ex:
+                    futures = {
+                        ex.submit(_ingest_one, safe_path, ext): name
+                        for name, safe_path, ext in to_ingest
+                    }
+                    for fut in as_completed(futures):
+                        name = futures[fut]
+                        try:
+                            name, text, ftype = fut.result()
+                        except ValueError:
+                            st.warning(f"Unsupported file type: {name}")
+                            continue
+                        except Exception as e:
+                            st.error(f"Failed to ingest {name}: {e}")
+                            continue
+
+                        if text and text.strip():
+                            all_docs[name] = {"text": text, "file_type": ftype}
+                            logging.info(f"Ingested {name} -> {len(text)} chars")
+                        else:
+                            st.warning(f"No text extracted from {name}. Skipping ingestion.")
+
+                # Transient copies on tmpfs are done once extraction finished.
+                if TMP_DIR != UPLOAD_DIR:
+                    for name, safe_path, ext in to_ingest:
+                        if ext not in PERSISTED_EXTS:
+                            try:
+                                os.remove(safe_path)
+                            except OSError:
+                                pass
 
             if all_docs:
                 vs.add_documents(all_docs)
+                # New documents change what retrieval returns, so answers
+                # cached against the old corpus are stale too — same
+                # reasoning as the clear-all invalidation.
+                get_semantic_cache.clear()
+                # Only now — with the documents actually indexed — do the
+                # digests and filenames become durable state; an
+                # add_documents failure leaves everything retryable.
+                for name in all_docs:
+                    st.session_state["ingested_hashes"][batch_digests[name]] = name
                 st.session_state["ingested_files"].extend(list(all_docs.keys()))
                 st.success(f"✅ Ingested {len(all_docs)} file(s) successfully!")
 
@@ -198,9 +313,28 @@ with tab2:
                                 st.warning(f"Could not play audio {source_name}: {e}")
 
                 try:
-                    llm = OllamaInference(model_name="phi:2.7b")
-                    context_texts = [item["text"] for item in retrieved if item.get("text")]
-                    answer = llm.generate_answer(prompt=query, context=context_texts)
+                    # Check the semantic cache first: a near-duplicate of a
+                    # previous query reuses its answer and skips inference.
+                    cache = get_semantic_cache()
+                    q_vec = vs.embed([query])
+                    faiss.normalize_L2(q_vec)
+
+                    answer = None
+                    if cache["index"] is not None and cache["index"].ntotal > 0:
+                        sims, ids = cache["index"].search(q_vec, 1)
+                        if sims[0][0] >= SEMANTIC_CACHE_THRESHOLD:
+                            answer = cache["answers"][ids[0][0]]
+                            logging.info(f"Semantic cache hit (sim={sims[0][0]:.3f})")
+
+                    if answer is None:
+                        llm = get_llm()
+                        context_texts = [item["snippet"] for item in retrieved if item.get("snippet")]
+                        answer = llm.generate_answer(prompt=query, context=context_texts)
+                        if cache["index"] is None:
+                            cache["index"] = faiss.IndexFlatIP(q_vec.shape[1])
+                        cache["index"].add(q_vec)
+                        cache["answers"].append(answer)
+
                     with st.expander("🧩 Generated Answer", expanded=True):
                         st.markdown(answer, unsafe_allow_html=True)
                 except Exception as e:
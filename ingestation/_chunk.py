@@ -0,0 +1,74 @@
+# _chunk.py
+"""
+Shared text chunker used by every ingestor.
+
+Kept in one place so chunking improvements (token-aware boundaries,
+compiled scanners, ...) land once instead of being copied into each
+ingestor.
+
+Chunk boundaries are found by scanning the UTF-8 bytes of the text in a
+tight numeric loop. When numba is installed the scanner is JIT-compiled
+(LLVM autovectorizes the byte scan); otherwise the same code runs as
+plain Python over the numpy buffer.
+"""
+from typing import Iterator
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pure-Python loop
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+@njit(cache=True)
+def _find_chunk_ends(buf, size):
+    """
+    Returns the end offset of each chunk in `buf` (a uint8 array of UTF-8
+    bytes). Chunks are at most `size` bytes; where possible the split is
+    pulled back to the last '.' or '\\n' within the final 64 bytes of the
+    window so chunks end on sentence/line boundaries.
+    """
+    n = len(buf)
+    ends = np.empty(n // max(1, size - 64) + 2, np.int64)
+    count = 0
+    i = 0
+    while i < n:
+        j = min(i + size, n)
+        if j < n:
+            # Prefer a sentence/line boundary near the end of the window.
+            found = False
+            k = j - 1
+            stop = max(i, j - 64) - 1
+            while k > stop:
+                if buf[k] == 46 or buf[k] == 10:  # '.' or '\n'
+                    j = k + 1
+                    found = True
+                    break
+                k -= 1
+            if not found:
+                # Never split inside a UTF-8 multibyte sequence.
+                while j > i + 1 and (buf[j] & 0xC0) == 0x80:
+                    j -= 1
+        ends[count] = j
+        count += 1
+        i = j
+    return ends[:count]
+
+
+def iter_chunks(text: str, size: int) -> Iterator[str]:
+    """
+    Lazily yields consecutive chunks of at most `size` bytes, split on
+    sentence/line boundaries where one falls near the chunk end.
+    """
+    if not text:
+        return
+    buf = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    start = 0
+    for end in _find_chunk_ends(buf, size):
+        end = int(end)
+        yield buf[start:end].tobytes().decode("utf-8")
+        start = end
@@ -1,11 +1,17 @@
 # ingest_audio.py
+import gc
 import os
-from typing import List, Dict, Optional
+from typing import ClassVar, List, Dict, Iterator, Optional
 import logging
 from faster_whisper import WhisperModel
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+try:
+    from ingestation._chunk import iter_chunks
+except ImportError:  # running as a script from inside ingestation/
+    from _chunk import iter_chunks
+
 
 class AudioIngestor:
     """
@@ -15,6 +21,11 @@ class AudioIngestor:
 
     SUPPORTED_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac", ".aac", ".ogg")
 
+    # Loaded models shared across instances, keyed by (model_size, device,
+    # compute_type). Loading "small" costs seconds and ~500MB, so paying it
+    # once per process instead of once per ingestor matters.
+    _model_cache: ClassVar[Dict[tuple, WhisperModel]] = {}
+
     def __init__(self, folder_path: Optional[str] = None, model_size: str = "small", chunk_size: int = 1000):
         """
         :param folder_path: folder containing audio files
@@ -28,9 +39,16 @@ class AudioIngestor:
             raise FileNotFoundError(f"Audio folder not found: {self.folder_path}")
 
         dev = "cpu"
-        
-        logging.info(f"Loading Faster Whisper model '{model_size}' ({dev})...")
-        self.model = WhisperModel(model_size, device=dev)
+        compute_type = "int8"  # INT8 quantized inference, ~2x faster than FP32 on CPU
+
+        key = (model_size, dev, compute_type)
+        model = AudioIngestor._model_cache.get(key)
+        if model is None:
+            logging.info(f"Loading Faster Whisper model '{model_size}' ({dev}, {compute_type})...")
+            model = AudioIngestor._model_cache.setdefault(
+                key, WhisperModel(model_size, device=dev, compute_type=compute_type)
+            )
+        self.model = model
 
     def transcribe_audio(self, file_path: str) -> str:
         """
@@ -41,27 +59,37 @@ class AudioIngestor:
 
         logging.info(f"Transcribing audio: {file_path}")
         try:
-            segments, _ = self.model.transcribe(file_path)
-            text = " ".join([segment.text for segment in segments])
+            # Greedy decoding + VAD: skip silence entirely and drop beam
+            # search, which buys 2-4x on CPU with negligible WER impact
+            # for ingestion-quality transcripts.
+            segments, _ = self.model.transcribe(
+                file_path,
+                beam_size=1,
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=500),
+                condition_on_previous_text=False,
+            )
+            text = " ".join(segment.text for segment in segments)
             return text.strip()
         except Exception as e:
             logging.error(f"Failed to transcribe audio {file_path}: {e}")
             return ""
 
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str) -> Iterator[str]:
         """
-        Splits text into chunks for embeddings.
+        Lazily yields chunks for embedding via the shared chunker.
         """
-        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        return iter_chunks(text, self.chunk_size)
 
-    def ingest_file(self, file_path: str) -> List[Dict[str, str]]:
+    def ingest_file(self, file_path: str) -> Iterator[Dict[str, str]]:
         """
-        Ingest a single audio file and return list of dicts for each text chunk:
-        [{ 'text': chunk, 'source': filename }]
+        Ingest a single audio file and lazily yield a dict per text chunk:
+        { 'text': chunk, 'source': filename }
         """
         text = self.transcribe_audio(file_path)
-        chunks = self.chunk_text(text)
-        return [{"text": chunk, "source": os.path.basename(file_path)} for chunk in chunks]
+        source = os.path.basename(file_path)
+        for chunk in self.chunk_text(text):
+            yield {"text": chunk, "source": source}
 
     def ingest_folder(self) -> List[Dict[str, str]]:
         """
@@ -76,8 +104,8 @@ class AudioIngestor:
             if filename.lower().endswith(self.SUPPORTED_EXTENSIONS):
                 full_path = os.path.join(self.folder_path, filename)
                 try:
-                    file_chunks = self.ingest_file(full_path)
-                    all_texts.extend(file_chunks)
+                    all_texts.extend(self.ingest_file(full_path))
+                    gc.collect()  # drop the per-file transcript before the next one
                 except Exception as e:
                     logging.error(f"Failed to ingest {filename}: {e}")
         logging.info(f"Total audio text chunks ingested: {len(all_texts)}")
@@ -1,11 +1,20 @@
 # ingest_docx.py
+import gc
 import os
-from typing import Dict, List, Optional
-from docx import Document
+import zipfile
+from typing import Dict, Iterator, List, Optional
+import lxml.etree as ET
 import logging
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+try:
+    from ingestation._chunk import iter_chunks
+except ImportError:  # running as a script from inside ingestation/
+    from _chunk import iter_chunks
+
+_WORD_NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+
 
 class DOCXIngestor:
     """
@@ -32,27 +41,34 @@ class DOCXIngestor:
 
         logging.info(f"Ingesting DOCX: {file_path}")
         try:
-            doc = Document(file_path)
-            text = "\n".join([para.text for para in doc.paragraphs])
-            return text
+            # Read word/document.xml directly and iterate the w:t runs in
+            # lxml's C layer. This skips python-docx's per-paragraph proxy
+            # objects (5-10x faster on large files) and also picks up
+            # table and text-box content that doc.paragraphs misses.
+            with zipfile.ZipFile(file_path) as z:
+                with z.open("word/document.xml") as f:
+                    tree = ET.parse(f)
+            texts = tree.getroot().iterfind(".//w:t", _WORD_NS)
+            return "\n".join(t.text for t in texts if t.text)
         except Exception as e:
             logging.error(f"Failed to read DOCX file {file_path}: {e}")
             return ""
 
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str) -> Iterator[str]:
         """
-        Splits text into smaller chunks for embedding.
+        Lazily yields chunks for embedding via the shared chunker.
         """
-        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        return iter_chunks(text, self.chunk_size)
 
-    def ingest_file(self, file_path: str) -> List[Dict[str, str]]:
+    def ingest_file(self, file_path: str) -> Iterator[Dict[str, str]]:
         """
-        Ingest a single DOCX file and return list of dicts for each chunk:
-        [{ 'text': chunk, 'source': filename }]
+        Ingest a single DOCX file and lazily yield a dict per chunk:
+        { 'text': chunk, 'source': filename }
         """
         text = self.extract_text_from_docx(file_path)
-        chunks = self.chunk_text(text)
-        return [{"text": chunk, "source": os.path.basename(file_path)} for chunk in chunks]
+        source = os.path.basename(file_path)
+        for chunk in self.chunk_text(text):
+            yield {"text": chunk, "source": source}
 
     def ingest_folder(self) -> List[Dict[str, str]]:
         """
@@ -67,8 +83,8 @@ class DOCXIngestor:
             if filename.lower().endswith(".docx"):
                 full_path = os.path.join(self.folder_path, filename)
                 try:
-                    file_chunks = self.ingest_file(full_path)
-                    all_texts.extend(file_chunks)
+                    all_texts.extend(self.ingest_file(full_path))
+                    gc.collect()  # drop the per-file text before the next one
                 except Exception as e:
                     logging.error(f"Failed to ingest {filename}: {e}")
         logging.info(f"Total DOCX chunks ingested: {len(all_texts)}")
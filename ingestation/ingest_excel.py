@@ -1,11 +1,18 @@
 # ingest_excel.py
+import gc
 import os
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import pandas as pd
+from openpyxl import load_workbook
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+try:
+    from ingestation._chunk import iter_chunks
+except ImportError:  # running as a script from inside ingestation/
+    from _chunk import iter_chunks
+
 
 class ExcelIngestor:
     """
@@ -34,31 +41,49 @@ class ExcelIngestor:
         logging.info(f"Ingesting Excel: {file_path}")
         text = ""
         try:
-            xls = pd.ExcelFile(file_path)
-            for sheet_name in xls.sheet_names:
-                df = pd.read_excel(xls, sheet_name=sheet_name)
-                # Convert all cells to string and join with separators
-                sheet_text = "\n".join(df.astype(str).apply(lambda x: " | ".join(x), axis=1).tolist())
-                text += f"\n--- Sheet: {sheet_name} ---\n{sheet_text}\n"
+            if file_path.lower().endswith(".xls"):
+                # Legacy binary format: openpyxl can't read it, fall back
+                # to pandas + xlrd.
+                xls = pd.ExcelFile(file_path, engine="xlrd")
+                for sheet_name in xls.sheet_names:
+                    df = pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
+                    arr = df.fillna("").to_numpy()
+                    sheet_text = "\n".join(" | ".join(row) for row in arr)
+                    text += f"\n--- Sheet: {sheet_name} ---\n{sheet_text}\n"
+            else:
+                # read_only uses openpyxl's streaming parser: no full
+                # in-memory XML tree, no DataFrame, no type inference —
+                # we only ever want the cells as strings.
+                wb = load_workbook(file_path, read_only=True, data_only=True)
+                try:
+                    for ws in wb.worksheets:
+                        sheet_text = "\n".join(
+                            " | ".join("" if c is None else str(c) for c in row)
+                            for row in ws.iter_rows(values_only=True)
+                        )
+                        text += f"\n--- Sheet: {ws.title} ---\n{sheet_text}\n"
+                finally:
+                    wb.close()
         except Exception as e:
             logging.error(f"Failed to extract text from {file_path}: {e}")
             return ""
         return text.strip()
 
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str) -> Iterator[str]:
         """
-        Splits text into smaller chunks for embedding.
+        Lazily yields chunks for embedding via the shared chunker.
         """
-        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        return iter_chunks(text, self.chunk_size)
 
-    def ingest_file(self, file_path: str) -> List[Dict[str, str]]:
+    def ingest_file(self, file_path: str) -> Iterator[Dict[str, str]]:
         """
-        Ingest a single Excel file and return list of dicts for each chunk:
-        [{ 'text': chunk, 'source': filename }]
+        Ingest a single Excel file and lazily yield a dict per chunk:
+        { 'text': chunk, 'source': filename }
         """
         text = self.extract_text_from_excel(file_path)
-        chunks = self.chunk_text(text)
-        return [{"text": chunk, "source": os.path.basename(file_path)} for chunk in chunks]
+        source = os.path.basename(file_path)
+        for chunk in self.chunk_text(text):
+            yield {"text": chunk, "source": source}
 
     def ingest_folder(self) -> List[Dict[str, str]]:
         """
@@ -73,8 +98,8 @@ class ExcelIngestor:
             if filename.lower().endswith((".xls", ".xlsx")):
                 full_path = os.path.join(self.folder_path, filename)
                 try:
-                    file_chunks = self.ingest_file(full_path)
-                    all_texts.extend(file_chunks)
+                    all_texts.extend(self.ingest_file(full_path))
+                    gc.collect()  # drop the per-file text before the next one
                 except Exception as e:
                     logging.error(f"Failed to ingest {filename}: {e}")
         logging.info(f"Total Excel chunks ingested: {len(all_texts)}")
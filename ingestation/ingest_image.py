@@ -1,12 +1,27 @@
 # ingest_image.py
+import gc
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from PIL import Image
-import pytesseract
 import logging
 
+try:
+    # Preferred: in-process Tesseract via the C++ API. Avoids the
+    # fork/exec of the tesseract binary that pytesseract pays per image,
+    # and releases the GIL during recognition so threads parallelize.
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+    import pytesseract
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+try:
+    from ingestation._chunk import iter_chunks
+except ImportError:  # running as a script from inside ingestation/
+    from _chunk import iter_chunks
+
 
 class ImageIngestor:
     """
@@ -36,26 +51,40 @@ class ImageIngestor:
         logging.info(f"Processing image: {file_path}")
         try:
             img = Image.open(file_path)
-            text = pytesseract.image_to_string(img)
+            # OCR time scales with pixel count and tesseract works on
+            # grayscale internally anyway: convert to 8-bit grayscale and
+            # cap the longest side at ~2000px (a no-op for small images).
+            img = img.convert("L")
+            w, h = img.size
+            scale = min(1.0, 2000 / max(w, h))
+            if scale < 1.0:
+                img = img.resize((int(w * scale), int(h * scale)), Image.BILINEAR)
+            if PyTessBaseAPI is not None:
+                with PyTessBaseAPI() as api:
+                    api.SetImage(img)
+                    text = api.GetUTF8Text()
+            else:
+                text = pytesseract.image_to_string(img)
             return text.strip()
         except Exception as e:
             logging.error(f"Failed to process image {file_path}: {e}")
             return ""
 
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str) -> Iterator[str]:
         """
-        Splits text into smaller chunks for embeddings.
+        Lazily yields chunks for embedding via the shared chunker.
         """
-        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        return iter_chunks(text, self.chunk_size)
 
-    def ingest_file(self, file_path: str) -> List[Dict[str, str]]:
+    def ingest_file(self, file_path: str) -> Iterator[Dict[str, str]]:
         """
-        Ingest a single image and return list of dicts for each text chunk:
-        [{ 'text': chunk, 'source': filename }]
+        Ingest a single image and lazily yield a dict per text chunk:
+        { 'text': chunk, 'source': filename }
         """
         text = self.extract_text_from_image(file_path)
-        chunks = self.chunk_text(text)
-        return [{"text": chunk, "source": os.path.basename(file_path)} for chunk in chunks]
+        source = os.path.basename(file_path)
+        for chunk in self.chunk_text(text):
+            yield {"text": chunk, "source": source}
 
     def ingest_folder(self) -> List[Dict[str, str]]:
         """
@@ -65,15 +94,22 @@ class ImageIngestor:
         if not self.folder_path:
             raise ValueError("Folder path not set for folder ingestion.")
 
+        paths = [
+            os.path.join(self.folder_path, filename)
+            for filename in os.listdir(self.folder_path)
+            if filename.lower().endswith(self.SUPPORTED_EXTENSIONS)
+        ]
+
+        # tesserocr releases the GIL during recognition, so a small thread
+        # pool overlaps OCR across images (pytesseract's subprocess model
+        # tolerates this too, just with less benefit).
         all_texts = []
-        for filename in os.listdir(self.folder_path):
-            if filename.lower().endswith(self.SUPPORTED_EXTENSIONS):
-                full_path = os.path.join(self.folder_path, filename)
-                try:
-                    file_chunks = self.ingest_file(full_path)
-                    all_texts.extend(file_chunks)
-                except Exception as e:
-                    logging.error(f"Failed to ingest {filename}: {e}")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for full_path, chunks in zip(
+                paths, executor.map(lambda p: list(self.ingest_file(p)), paths)
+            ):
+                all_texts.extend(chunks)
+        gc.collect()
         logging.info(f"Total image text chunks ingested: {len(all_texts)}")
         return all_texts
 
@@ -1,11 +1,50 @@
 # ingest_pdf.py
 import fitz  # PyMuPDF
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import gc
+from typing import Dict, Iterator, List, Optional
 import logging
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+try:
+    from ingestation._chunk import iter_chunks
+except ImportError:  # running as a script from inside ingestation/
+    from _chunk import iter_chunks
+
+# Below this page count, thread workers beat process workers: PyMuPDF
+# releases the GIL during extraction, and threads skip the interpreter
+# spawn/pickle cost that dominates on short documents.
+_PROCESS_POOL_MIN_PAGES = 64
+
+
+def _page_text(page) -> str:
+    # Plain "text" mode with preserved whitespace skips the extra layout
+    # analysis of the default pipeline — all RAG ingestion needs.
+    return page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+
+
+def _extract_page(args) -> str:
+    """
+    Extract text from a single page. Runs in a worker process, so it
+    re-opens the document itself and must stay a top-level function.
+    """
+    file_path, page_idx = args
+    with fitz.open(file_path) as pdf:
+        return _page_text(pdf[page_idx])
+
+
+def _extract_range(args) -> List[str]:
+    """
+    Extract text from a contiguous range of pages. Each thread worker
+    opens its own Document — MuPDF Documents are not shareable across
+    threads.
+    """
+    file_path, start, stop = args
+    with fitz.open(file_path) as pdf:
+        return [_page_text(pdf[i]) for i in range(start, stop)]
+
 
 class PDFIngestor:
     """
@@ -32,32 +71,58 @@ class PDFIngestor:
             raise FileNotFoundError(f"PDF file not found: {file_path}")
 
         logging.info(f"Ingesting PDF: {file_path}")
-        text = ""
         try:
+            # One cheap open to learn the page count, then extract pages
+            # in parallel across worker processes. executor.map preserves
+            # submission order, so concatenation keeps page order; the
+            # chunksize batches blocks of pages per task to amortize the
+            # per-worker fitz.open cost.
             with fitz.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf):
-                    page_text = page.get_text()
-                    text += page_text + "\n"
+                n_pages = pdf.page_count
+            if n_pages == 0:
+                return ""
+
+            if n_pages < _PROCESS_POOL_MIN_PAGES:
+                # Thread pool over contiguous page ranges, one Document
+                # per worker. map() preserves order.
+                workers = min(4, n_pages)
+                step = -(-n_pages // workers)  # ceil division
+                ranges = [
+                    (file_path, start, min(start + step, n_pages))
+                    for start in range(0, n_pages, step)
+                ]
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    blocks = executor.map(_extract_range, ranges)
+                    return "\n".join(page for block in blocks for page in block)
+
+            workers = max(1, (os.cpu_count() or 2) - 1)
+            chunksize = max(1, n_pages // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pages = executor.map(
+                    _extract_page,
+                    [(file_path, i) for i in range(n_pages)],
+                    chunksize=chunksize,
+                )
+                return "\n".join(pages)
         except Exception as e:
             logging.error(f"Failed to extract text from {file_path}: {e}")
             return ""
-        return text
 
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str) -> Iterator[str]:
         """
-        Splits text into smaller chunks for better RAG embedding performance.
+        Lazily yields chunks for embedding via the shared chunker.
         """
-        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
-        return chunks
+        return iter_chunks(text, self.chunk_size)
 
-    def ingest_file(self, file_path: str) -> List[Dict[str, str]]:
+    def ingest_file(self, file_path: str) -> Iterator[Dict[str, str]]:
         """
-        Ingest a single PDF file and return list of dicts for each chunk:
-        [{ 'text': chunk, 'source': filename }]
+        Ingest a single PDF file and lazily yield a dict per chunk:
+        { 'text': chunk, 'source': filename }
         """
         text = self.extract_text_from_pdf(file_path)
-        chunks = self.chunk_text(text)
-        return [{"text": chunk, "source": os.path.basename(file_path)} for chunk in chunks]
+        source = os.path.basename(file_path)
+        for chunk in self.chunk_text(text):
+            yield {"text": chunk, "source": source}
 
     def ingest_folder(self) -> List[Dict[str, str]]:
         """
@@ -72,8 +137,8 @@ class PDFIngestor:
             if filename.lower().endswith(".pdf"):
                 full_path = os.path.join(self.folder_path, filename)
                 try:
-                    file_chunks = self.ingest_file(full_path)
-                    all_texts.extend(file_chunks)
+                    all_texts.extend(self.ingest_file(full_path))
+                    gc.collect()  # drop the per-file text before the next one
                 except Exception as e:
                     logging.error(f"Failed to ingest {filename}: {e}")
         logging.info(f"Total PDF chunks ingested: {len(all_texts)}")
@@ -1,11 +1,17 @@
 # ingest_pptx.py
+import gc
 import os
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from pptx import Presentation
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+try:
+    from ingestation._chunk import iter_chunks
+except ImportError:  # running as a script from inside ingestation/
+    from _chunk import iter_chunks
+
 
 class PPTXIngestor:
     """
@@ -53,20 +59,21 @@ class PPTXIngestor:
             return ""
         return text.strip()
 
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str) -> Iterator[str]:
         """
-        Splits text into smaller chunks for embedding.
+        Lazily yields chunks for embedding via the shared chunker.
         """
-        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        return iter_chunks(text, self.chunk_size)
 
-    def ingest_file(self, file_path: str) -> List[Dict[str, str]]:
+    def ingest_file(self, file_path: str) -> Iterator[Dict[str, str]]:
         """
-        Ingest a single PPTX file and return list of dicts for each chunk:
-        [{ 'text': chunk, 'source': filename }]
+        Ingest a single PPTX file and lazily yield a dict per chunk:
+        { 'text': chunk, 'source': filename }
         """
         text = self.extract_text_from_pptx(file_path)
-        chunks = self.chunk_text(text)
-        return [{"text": chunk, "source": os.path.basename(file_path)} for chunk in chunks]
+        source = os.path.basename(file_path)
+        for chunk in self.chunk_text(text):
+            yield {"text": chunk, "source": source}
 
     def ingest_folder(self) -> List[Dict[str, str]]:
         """
@@ -81,8 +88,8 @@ class PPTXIngestor:
             if filename.lower().endswith(".pptx"):
                 full_path = os.path.join(self.folder_path, filename)
                 try:
-                    file_chunks = self.ingest_file(full_path)
-                    all_texts.extend(file_chunks)
+                    all_texts.extend(self.ingest_file(full_path))
+                    gc.collect()  # drop the per-file text before the next one
                 except Exception as e:
                     logging.error(f"Failed to ingest {filename}: {e}")
         logging.info(f"Total PPTX chunks ingested: {len(all_texts)}")
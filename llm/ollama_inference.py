@@ -1,6 +1,9 @@
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
-from ollama import chat, ChatResponse
+from collections import OrderedDict
+from typing import Iterator, List, Optional
+from ollama import AsyncClient, chat
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
@@ -8,8 +11,19 @@ class OllamaInference:
     """
     Local LLM inference using Ollama's official Python API.
     Compatible with retrieval-augmented generation (RAG) context.
+
+    Batched generation (agenerate_batch) fans requests out concurrently;
+    set the OLLAMA_NUM_PARALLEL env var on the server to control how many
+    it decodes in parallel.
     """
 
+    # Completed responses shared across instances, keyed by
+    # (model, prompt-hash). A repeated prompt costs a dict lookup instead
+    # of a full decode; bounded LRU so demo/benchmark traffic can't grow
+    # it without limit.
+    _response_cache: OrderedDict = OrderedDict()
+    _response_cache_max = 256
+
     def __init__(self, model_name: str = "phi:2.7b"):
         """
         Initialize an Ollama inference instance.
@@ -17,13 +31,94 @@ class OllamaInference:
             model_name: The local Ollama model name (e.g., 'phi:2.7b', 'llama3', 'gemma3')
         """
         self.model_name = model_name
+        self._aclient = AsyncClient()
         logging.info(f"Initialized OllamaInference with model '{self.model_name}'")
 
+    def _cache_key(self, full_prompt: str) -> str:
+        payload = (self.model_name + "\0" + full_prompt).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _cache_put(self, key: str, text: str):
+        cache = OllamaInference._response_cache
+        cache[key] = text
+        cache.move_to_end(key)
+        while len(cache) > self._response_cache_max:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _build_prompt(prompt: str, context: Optional[List[str]] = None) -> str:
+        """Fold optional RAG context into the final user prompt.
+
+        Built with one join over all the pieces so the context is copied
+        once, not joined and then copied again into an f-string — it adds
+        up when batch mode ships tens-of-KB contexts.
+        """
+        if context:
+            parts = ["Context:\n"]
+            for c in context:
+                parts.append(c)
+                parts.append("\n\n")
+            parts.append("Question:\n")
+            parts.append(prompt)
+            return "".join(parts)
+        return prompt
+
+    async def _achat(self, full_prompt: str) -> str:
+        """Single async chat round-trip returning the stripped answer."""
+        response = await self._aclient.chat(
+            model=self.model_name,
+            messages=[{"role": "user", "content": full_prompt}],
+        )
+        return response.message.content.strip()
+
+    async def agenerate_batch(
+        self,
+        prompts: List[str],
+        contexts: Optional[List[Optional[List[str]]]] = None,
+    ) -> List[str]:
+        """
+        Generate answers for many prompts concurrently. Requests overlap
+        network I/O and server-side decoding, so throughput scales up to
+        the server's OLLAMA_NUM_PARALLEL cap instead of serializing
+        round-trips.
+        """
+        if contexts is None:
+            contexts = [None] * len(prompts)
+        full_prompts = [self._build_prompt(p, c) for p, c in zip(prompts, contexts)]
+        logging.info(f"Sending {len(full_prompts)} concurrent requests to '{self.model_name}'...")
+        return await asyncio.gather(*(self._achat(p) for p in full_prompts))
+
+    def stream_answer(
+        self,
+        prompt: str,
+        context: Optional[List[str]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream the model's answer as a generator of text fragments.
+
+        Rendering is left to the consumer (terminal, Streamlit, SSE),
+        so token throughput isn't tied to stdout flushes.
+        """
+        full_prompt = self._build_prompt(prompt, context)
+        logging.info(f"Streaming request to Ollama model '{self.model_name}'...")
+        try:
+            stream_resp = chat(
+                model=self.model_name,
+                messages=[{"role": "user", "content": full_prompt}],
+                stream=True
+            )
+            for chunk in stream_resp:
+                yield chunk["message"]["content"]
+        except Exception as e:
+            logging.error(f"Ollama inference failed: {e}")
+            raise RuntimeError(f"Ollama inference failed: {e}")
+
     def generate_answer(
         self, 
-        prompt: str, 
-        context: Optional[List[str]] = None, 
-        stream: bool = False
+        prompt: str,
+        context: Optional[List[str]] = None,
+        stream: bool = False,
+        cache: bool = True
     ) -> str:
         """
         Generate an answer from the local Ollama model.
@@ -31,40 +126,41 @@ class OllamaInference:
             prompt: The user question or task prompt.
             context: Optional list of retrieved context strings for RAG.
             stream: If True, stream responses progressively.
+            cache: If True, reuse/store the full response for identical
+                (model, prompt, context) requests.
         Returns:
             Final model response as a string.
         """
         # Construct the final message for the LLM
-        if context:
-            context_text = "\n\n".join(context)
-            full_prompt = f"Context:\n{context_text}\n\nQuestion:\n{prompt}"
-        else:
-            full_prompt = prompt
+        full_prompt = self._build_prompt(prompt, context)
+
+        key = self._cache_key(full_prompt)
+        if cache and key in self._response_cache:
+            logging.info("Response cache hit; skipping Ollama request.")
+            return self._response_cache[key]
 
         logging.info(f"Sending request to Ollama model '{self.model_name}'...")
 
         try:
             if stream:
-                # Streamed output for live updates (good for Streamlit or terminal apps)
-                response_text = ""
-                stream_resp = chat(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": full_prompt}],
-                    stream=True
-                )
-                for chunk in stream_resp:
-                    content = chunk["message"]["content"]
-                    print(content, end="", flush=True)
-                    response_text += content
-                print()  # newline after stream
-                return response_text.strip()
+                # Drain the token generator; callers wanting live updates
+                # should iterate stream_answer directly.
+                text = "".join(self.stream_answer(prompt, context)).strip()
             else:
-                # Standard non-streaming generation
-                response: ChatResponse = chat(
+                # Synchronous client here on purpose: _aclient's pooled
+                # connections are bound to the event loop they were opened
+                # on, so reusing it across asyncio.run() calls fails with
+                # "Event loop is closed" on the second request. The async
+                # client is reserved for agenerate_batch.
+                response = chat(
                     model=self.model_name,
                     messages=[{"role": "user", "content": full_prompt}],
                 )
-                return response.message.content.strip()
+                text = response.message.content.strip()
+
+            if cache:
+                self._cache_put(key, text)
+            return text
 
         except Exception as e:
             logging.error(f"Ollama inference failed: {e}")
@@ -1,62 +1,297 @@
 # vector_store.py
+import functools
+import hashlib
+import math
 import os
-import pickle
 import time
 import logging
-from typing import List, Dict
+from collections import OrderedDict
+from typing import List, Dict, Optional
 import faiss
+import numpy as np
+import pyarrow as pa
 from sentence_transformers import SentenceTransformer
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
-    
+
+# ANN search parallelizes across queries via OpenMP; use every core.
+faiss.omp_set_num_threads(os.cpu_count() or 1)
+
+try:
+    import torch
+    # Cap intra-op threads so the PyTorch encoder doesn't oversubscribe
+    # cores already claimed by FAISS's OpenMP pool.
+    torch.set_num_threads(min(os.cpu_count() or 1, 4))
+except ImportError:
+    torch = None
+
+
+@functools.lru_cache(maxsize=4)
+def _get_st(model_name: str, device: str, backend: str = "torch",
+            file_name: Optional[str] = None) -> SentenceTransformer:
+    """One shared SentenceTransformer per (model, device, backend, file).
+
+    Tokenizer and weights are the expensive part of a VectorStore, so
+    extra instances (tests, multi-tenant setups, future rerankers) reuse
+    the loaded model instead of multiplying init time and memory.
+    """
+    if backend == "torch":
+        return SentenceTransformer(model_name, device=device)
+    model_kwargs = {"file_name": file_name} if file_name else {}
+    return SentenceTransformer(
+        model_name, device=device, backend="onnx", model_kwargs=model_kwargs
+    )
+
+
 class VectorStore:
     """FAISS vector store for multimodal documents (RAG-ready)."""
 
     def __init__(self,
                  index_path: str = "embeddings/faiss_index.index",
-                 meta_path: str = "embeddings/meta.pkl",
+                 meta_path: str = "embeddings/meta.arrow",
                  model_name: str = "all-MiniLM-L6-v2",
-                 device: str ="cpu"):
+                 device: str ="cpu",
+                 backend: str = "onnx-int8",
+                 index_type: str = "auto",
+                 hnsw_m: int = 32,
+                 ef_construction: int = 40,
+                 ef_search: int = 16,
+                 use_gpu: bool = False,
+                 search_backend: str = "faiss"):
         self.index_path = index_path
         self.meta_path = meta_path
         self.model_name = model_name
         self.device = device
+        self.backend = backend
+        # "auto" keeps exact brute force while the corpus is tiny (where
+        # a flat scan wins anyway), picks HNSW (sub-linear search, no
+        # training) once it grows, and IVFPQ beyond RAM-comfortable
+        # sizes; "flat" forces exact search.
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        # GPU search only pays off for batched queries (single queries are
+        # dominated by host/device transfer), so the GPU copy is a clone
+        # used by query_batch; the CPU index stays authoritative for
+        # adds/saves.
+        self.use_gpu = use_gpu
+        self._gpu_index = None
+        self._gpu_res = None
+        # "torch" answers queries with a single MKL GEMM + topk over the
+        # raw embedding matrix, which beats FAISS's small-batch flat path
+        # on CPU for moderate corpora; the FAISS index stays authoritative
+        # for storage, so this is purely a search-time shortcut.
+        self.search_backend = search_backend
+        self._emb_mat = None  # lazily reconstructed torch.Tensor
+        self._index_mmapped = False  # True while the index is a read-only mapping
 
         self.model = None  # Lazy-load
         self.index = None
-        self.metadata = []
+        # Metadata lives in a memory-mapped Arrow table (columnar, paged
+        # in on demand) instead of a wholesale-unpickled list of dicts.
+        self._meta: Optional[pa.Table] = None
+        self._mm = None
+        self._source_rows: Dict[str, int] = {}  # source -> row, for dup detection
+        # On-disk embedding cache keyed by (model, text) content hash, so
+        # re-ingests and index rebuilds only encode genuinely new text.
+        self.emb_cache_path = os.path.join(
+            os.path.dirname(self.index_path) or ".", "emb_cache.npz"
+        )
+        self._emb_cache: Dict[str, np.ndarray] = {}
+        # Retrieval-result LRU keyed by normalized query text + top_k.
+        # Stores only the hit sources (small); snippets are
+        # re-materialized from metadata on a hit. Invalidated whenever
+        # the index changes.
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_max = 256
         self._load_index()
 
     def _load_model(self):
-        if self.model is None:
-            logging.info(f"Loading embedding model '{self.model_name}' on {self.device}...")
+        if self.model is not None:
+            return
+        logging.info(f"Loading embedding model '{self.model_name}' on {self.device}...")
+        if self.backend == "onnx-int8":
             try:
-                self.model = SentenceTransformer(self.model_name, device=self.device)
+                self.model = self._load_int8_model()
+                return
             except Exception as e:
-                logging.error(f"Model load failed ({e}), retrying on CPU...")
-                self.model = SentenceTransformer(self.model_name, device="cpu")
+                logging.error(f"INT8 ONNX model load failed ({e}), falling back to PyTorch...")
+        elif self.backend == "onnx":
+            # FP32 ONNX via onnxruntime (CPUExecutionProvider with graph
+            # optimizations): 2-3x over the PyTorch forward pass on CPU
+            # without the quantization step. encode() semantics are
+            # unchanged — same tokenizer, pooling and numpy return.
+            try:
+                self.model = _get_st(self.model_name, self.device, backend="onnx")
+                return
+            except Exception as e:
+                logging.error(f"ONNX model load failed ({e}), falling back to PyTorch...")
+        try:
+            self.model = _get_st(self.model_name, self.device)
+        except Exception as e:
+            logging.error(f"Model load failed ({e}), retrying on CPU...")
+            self.model = _get_st(self.model_name, "cpu")
+
+    def _load_int8_model(self) -> SentenceTransformer:
+        """
+        Load a dynamically INT8-quantized ONNX export of the embedding
+        model (exported once, cached next to the index). On x86 this runs
+        onnxruntime's INT8 dot-product kernels (VNNI) instead of FP32
+        GEMMs — typically 2-4x encode throughput with <1% similarity
+        drift for MiniLM-class models.
+        """
+        from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+        # The export is derived from the model, not the corpus, so it
+        # lives in the user cache dir rather than the data directory the
+        # "Clear All Data" button deletes — clearing documents shouldn't
+        # force a re-quantization (or a model re-download) on restart.
+        cache_root = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        )
+        quant_dir = os.path.join(cache_root, "novarag", "onnx-int8")
+        quant_file = "onnx/model_qint8_avx512_vnni.onnx"
+        if not os.path.exists(os.path.join(quant_dir, quant_file)):
+            logging.info("Exporting INT8-quantized ONNX embedding model (one-time)...")
+            model = SentenceTransformer(self.model_name, device="cpu", backend="onnx")
+            model.save_pretrained(quant_dir)
+            export_dynamic_quantized_onnx_model(model, "avx512_vnni", quant_dir)
+        return _get_st(quant_dir, "cpu", backend="onnx", file_name=quant_file)
 
     # ----------------------------
     # Index Management
     # ----------------------------
+    @property
+    def num_docs(self) -> int:
+        return 0 if self._meta is None else self._meta.num_rows
+
+    def _open_meta(self, source_rows: Optional[Dict[str, int]] = None):
+        """Memory-map the Arrow metadata file. Columns are paged in on
+        demand by the OS, so startup cost and resident memory track the
+        working set rather than the full metadata size.
+
+        The source->row map is rebuilt from the table only when the caller
+        can't supply a current one (i.e. at startup); incremental saves
+        pass theirs through so per-ingest work stays O(new docs), not
+        O(corpus).
+        """
+        self._close_meta()
+        self._mm = pa.memory_map(self.meta_path)
+        self._meta = pa.ipc.open_file(self._mm).read_all()
+        if "snippet" not in self._meta.column_names:
+            # Migrate pre-snippet metadata: derive the stored snippet from
+            # the legacy full-text column and drop the text. Persisted on
+            # the next save.
+            snippets = [
+                t[:500] + ("..." if len(t) > 500 else "")
+                for t in self._meta.column("text").to_pylist()
+            ]
+            self._meta = (
+                self._meta
+                .drop(["text"])
+                .append_column("snippet", pa.array(snippets))
+                .select(["source", "snippet", "file_type", "ingested_at"])
+            )
+        if source_rows is not None and len(source_rows) == self._meta.num_rows:
+            self._source_rows = source_rows
+        else:
+            self._source_rows = {
+                src: i for i, src in enumerate(self._meta.column("source").to_pylist())
+            }
+
+    def _close_meta(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _migrate_pickle_meta(self, pkl_path: str):
+        """One-time upgrade of a pre-Arrow store: rewrite the legacy
+        pickled metadata list as the Arrow file so the existing index
+        keeps serving instead of being silently overwritten by a fresh
+        start. The pickle is deleted once the Arrow file lands; on any
+        failure the store refuses to start fresh rather than clobber
+        the user's corpus on the next save.
+        """
+        import pickle
+
+        logging.info("Migrating legacy pickled metadata to Arrow...")
+        try:
+            with open(pkl_path, "rb") as f:
+                metadata = pickle.load(f)
+            texts = [m.get("text", "") for m in metadata]
+            table = pa.table({
+                "source": [m.get("source") for m in metadata],
+                "snippet": [t[:500] + ("..." if len(t) > 500 else "") for t in texts],
+                "file_type": [m.get("file_type", "text") for m in metadata],
+                "ingested_at": [float(m.get("ingested_at", 0.0)) for m in metadata],
+            })
+            tmp_path = self.meta_path + ".tmp"
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, self.meta_path)
+            os.remove(pkl_path)
+            logging.info(f"Migrated {table.num_rows} metadata rows from {pkl_path}.")
+        except Exception as e:
+            logging.error(f"Legacy metadata migration failed: {e}")
+            raise RuntimeError(
+                f"Refusing to start fresh over an existing index; "
+                f"fix or remove {pkl_path} and restart."
+            )
+
     def _load_index(self):
+        legacy_pkl = os.path.join(os.path.dirname(self.meta_path) or ".", "meta.pkl")
+        if (
+            os.path.exists(self.index_path)
+            and not os.path.exists(self.meta_path)
+            and os.path.exists(legacy_pkl)
+        ):
+            self._migrate_pickle_meta(legacy_pkl)
         if os.path.exists(self.index_path) and os.path.exists(self.meta_path):
             logging.info("Loading existing FAISS index and metadata...")
-            self.index = faiss.read_index(self.index_path)
-            with open(self.meta_path, "rb") as f:
-                self.metadata = pickle.load(f)
-            logging.info(f"Loaded {len(self.metadata)} documents from vector store.")
+            # Memory-map the index like the metadata: startup is a mmap
+            # syscall instead of an O(index_size) read, and resident
+            # memory tracks the vectors actually touched by searches.
+            # Not every index type supports mmapped reads, so fall back
+            # to an eager load where FAISS refuses.
+            try:
+                self.index = faiss.read_index(
+                    self.index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+                self._index_mmapped = True
+            except RuntimeError:
+                self.index = faiss.read_index(self.index_path)
+                self._index_mmapped = False
+            self._open_meta()
+            logging.info(f"Loaded {self.num_docs} documents from vector store.")
         else:
             logging.info("No existing index found. Starting fresh.")
             self.index = None
-            self.metadata = []
+            self._meta = None
+            self._source_rows = {}
+        if os.path.exists(self.emb_cache_path):
+            with np.load(self.emb_cache_path) as cached:
+                self._emb_cache = {k: cached[k] for k in cached.files}
+            logging.info(f"Loaded {len(self._emb_cache)} cached embeddings.")
 
     def _save_index(self):
         os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
         faiss.write_index(self.index, self.index_path)
-        with open(self.meta_path, "wb") as f:
-            pickle.dump(self.metadata, f)
-        logging.info(f"Vector store saved with {len(self.metadata)} unique documents.")
+        if self._meta is not None:
+            # Write to a sidecar first (the live table may be backed by
+            # the current mapping), then swap and remap.
+            tmp_path = self.meta_path + ".tmp"
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, self._meta.schema) as writer:
+                    writer.write_table(self._meta)
+            source_rows = self._source_rows
+            self._close_meta()
+            os.replace(tmp_path, self.meta_path)
+            self._open_meta(source_rows)
+        if self._emb_cache:
+            np.savez(self.emb_cache_path, **self._emb_cache)
+        logging.info(f"Vector store saved with {self.num_docs} unique documents.")
 
     # ----------------------------
     # Public Methods
@@ -64,19 +299,114 @@ class VectorStore:
     def clear(self):
         """Completely clears the FAISS index and metadata."""
         self.index = None
-        self.metadata = []
+        self._gpu_index = None
+        self._emb_mat = None
+        self._close_meta()
+        self._meta = None
+        self._source_rows = {}
+        self._emb_cache = {}
+        self._query_cache.clear()
         if os.path.exists(self.index_path):
             os.remove(self.index_path)
         if os.path.exists(self.meta_path):
             os.remove(self.meta_path)
+        if os.path.exists(self.emb_cache_path):
+            os.remove(self.emb_cache_path)
         logging.info("✅ Vector store fully cleared (index + metadata).")
 
+    def _new_index(self, dim: int, expected_n: int) -> faiss.Index:
+        """Build an empty index of the configured type."""
+        index_type = self.index_type
+        if index_type == "auto":
+            if expected_n < 1_000:
+                index_type = "flat"
+            elif expected_n < 100_000:
+                index_type = "hnsw"
+            else:
+                index_type = "ivfpq"
+
+        if index_type == "hnsw":
+            # Graph-based ANN: ~log(N) search, no training step.
+            index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.ef_construction
+            return index
+        if index_type == "ivfsq":
+            # Inverted lists + 8-bit scalar quantization: ~4x smaller
+            # stored vectors (so 4x the effective memory bandwidth) and
+            # FAISS's int8 SIMD distance kernels. To move an existing
+            # store onto this type, clear() and re-ingest — the embedding
+            # cache makes the rebuild encode-free.
+            nlist = max(1, int(4 * math.sqrt(expected_n)))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer, dim, nlist,
+                faiss.ScalarQuantizer.QT_8bit,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+            index.nprobe = 8
+            return index
+        if index_type == "ivfpq":
+            # Inverted lists + product quantization: sub-linear search and
+            # ~8-16x less memory than flat fp32 storage.
+            nlist = max(1, int(math.sqrt(expected_n)))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, 16, 8, faiss.METRIC_INNER_PRODUCT)
+            index.nprobe = 8
+            return index
+        return faiss.IndexFlatIP(dim)
+
+    @staticmethod
+    def _prep_embeddings(emb: np.ndarray) -> np.ndarray:
+        """
+        Make embeddings FAISS-ready: C-contiguous float32 (so the AVX2
+        kernels run at full width without an internal copy), L2-normalized
+        once so inner-product search equals cosine similarity.
+        """
+        emb = np.ascontiguousarray(emb, dtype=np.float32)
+        faiss.normalize_L2(emb)
+        return emb
+
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Sequence lengths used to order smart batches; falls back to
+        character counts if the tokenizer isn't exposed."""
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(texts, truncation=False, padding=False)
+                return [len(ids) for ids in encoded["input_ids"]]
+            except Exception:
+                pass
+        return [len(t) for t in texts]
+
+    def _cache_key(self, text: str) -> str:
+        """Embedding-cache key: content hash of model name + text."""
+        payload = (self.model_name + "\0" + text).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def warmup(self):
+        """
+        Eagerly load the embedding model and run one throwaway encode and
+        search, so the first real query doesn't absorb model load and
+        kernel-init latency. Intended to be called once at app startup.
+        """
+        self._load_model()
+        emb = self._prep_embeddings(
+            self.model.encode(["warmup"], show_progress_bar=False, convert_to_numpy=True)
+        )
+        if self.index is not None and self.num_docs > 0:
+            self.index.search(emb, 1)
+        logging.info("Vector store warmed up.")
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with the store's own model (e.g. for semantic caching)."""
+        self._load_model()
+        return self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+
     def add_documents(self, data: Dict[str, Dict[str, str]], force_reingest: bool = False):
         """Add documents to the vector store."""
         self._load_model()
 
-        texts, new_metadata = [], []
-        existing_sources = {m["source"] for m in self.metadata}
+        texts, new_metadata, stale = [], [], []
 
         for fname, info in data.items():
             text = info.get("text", "").strip()
@@ -84,14 +414,16 @@ class VectorStore:
             if not text:
                 continue
 
-            if not force_reingest and fname in existing_sources:
-                logging.warning(f"Skipping duplicate source: {fname}")
-                continue
+            if fname in self._source_rows:
+                if not force_reingest:
+                    logging.warning(f"Skipping duplicate source: {fname}")
+                    continue
+                stale.append((fname, self._source_rows[fname]))
 
             texts.append(text)
             new_metadata.append({
                 "source": fname,
-                "text": text,
+                "snippet": text[:500] + ("..." if len(text) > 500 else ""),
                 "file_type": file_type,
                 "ingested_at": time.time()
             })
@@ -100,44 +432,266 @@ class VectorStore:
             logging.warning("No new text data to add.")
             return
 
-        logging.info(f"Generating embeddings for {len(texts)} documents...")
-        embeddings = self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+        if stale:
+            # Replace-on-reingest happens at write time: drop the old
+            # vectors so searches never return duplicate sources and the
+            # query path needs no per-hit dedup.
+            texts, new_metadata = self._remove_stale(stale, texts, new_metadata)
+            if not texts:
+                logging.warning("No new text data to add after dedup.")
+                return
+
+        keys = [self._cache_key(t) for t in texts]
+        miss_idx = [i for i, k in enumerate(keys) if k not in self._emb_cache]
+        logging.info(
+            f"Generating embeddings for {len(miss_idx)} of {len(texts)} documents "
+            f"({len(texts) - len(miss_idx)} cached)..."
+        )
+        if miss_idx:
+            miss_texts = [texts[i] for i in miss_idx]
+            # Smart batching: encode in length-sorted order so each
+            # mini-batch pads only to its own longest text, then restore
+            # input order. Sorting by tokenized length (what the model
+            # actually pads on) beats character counts when documents mix
+            # scripts or whitespace density.
+            order = np.argsort(self._token_lengths(miss_texts), kind="stable")
+            sorted_embs = self.model.encode(
+                [miss_texts[i] for i in order],
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+            miss_embs = np.empty_like(sorted_embs)
+            miss_embs[order] = sorted_embs
+            for i, emb in zip(miss_idx, miss_embs):
+                self._emb_cache[keys[i]] = emb
+
+        if len(miss_idx) == len(keys):
+            # Fresh ingest: miss_embs is already the full matrix in input
+            # order, so hand it to _prep_embeddings directly instead of
+            # re-stacking row by row from the cache.
+            embeddings = self._prep_embeddings(miss_embs)
+        else:
+            embeddings = self._prep_embeddings(np.stack([self._emb_cache[k] for k in keys]))
 
         if self.index is None:
             logging.info("Creating new FAISS index...")
-            dim = embeddings.shape[1]
-            self.index = faiss.IndexFlatL2(dim)
+            # IDMap2 assigns explicit ids (= metadata rows), so vectors
+            # can be removed on re-ingest without renumbering survivors.
+            self.index = faiss.IndexIDMap2(
+                self._new_index(embeddings.shape[1], len(embeddings))
+            )
         else:
             logging.info("Adding to existing FAISS index...")
+            if self._index_mmapped:
+                # The mapping is read-only; swap in a mutable in-RAM copy
+                # before adding. The next process start maps it again.
+                self.index = faiss.read_index(self.index_path)
+                self._index_mmapped = False
 
-        self.index.add(embeddings)
-        self.metadata.extend(new_metadata)
+        if not self.index.is_trained:
+            self.index.train(embeddings)
+        base = self.num_docs
+        if isinstance(self.index, faiss.IndexIDMap2):
+            ids = np.arange(base, base + len(embeddings), dtype=np.int64)
+            self.index.add_with_ids(embeddings, ids)
+        else:
+            # Pre-IDMap index from an older store: sequential ids still
+            # line up with rows because nothing was ever removed.
+            self.index.add(embeddings)
+        self._gpu_index = None  # stale after mutation; recloned on demand
+        self._emb_mat = None  # torch search matrix likewise
+
+        new_table = pa.table({
+            "source": [m["source"] for m in new_metadata],
+            "snippet": [m["snippet"] for m in new_metadata],
+            "file_type": [m["file_type"] for m in new_metadata],
+            "ingested_at": [m["ingested_at"] for m in new_metadata],
+        })
+        self._meta = new_table if self._meta is None else pa.concat_tables([self._meta, new_table])
+        for offset, m in enumerate(new_metadata):
+            self._source_rows[m["source"]] = base + offset
+        self._query_cache.clear()  # cached top-k sets are stale now
         self._save_index()
 
     def query(self, query_text: str, top_k: int = 3) -> List[Dict[str, str]]:
         """Retrieve top_k relevant documents for a given query."""
         self._load_model()
 
-        if self.index is None or not self.metadata:
+        if self.index is None or self.num_docs == 0:
             raise ValueError("FAISS index not built yet. Ingest documents first.")
 
         top_k = int(top_k)
-        top_k = max(1, min(top_k, len(self.metadata)))
+        top_k = max(1, min(top_k, self.num_docs))
 
-        query_emb = self.model.encode([query_text], convert_to_numpy=True)
-        distances, indices = self.index.search(query_emb, top_k)
+        # Repeated semantic searches skip encoding and FAISS entirely:
+        # the cache keys on whitespace/case-normalized query text.
+        norm = " ".join(query_text.lower().split())
+        cache_key = (hashlib.blake2b(norm.encode("utf-8"), digest_size=16).hexdigest(), top_k)
+        cached_sources = self._query_cache.get(cache_key)
+        if cached_sources is not None:
+            self._query_cache.move_to_end(cache_key)
+            results = self._collect_results(
+                [self._source_rows[s] for s in cached_sources if s in self._source_rows]
+            )
+            logging.info(f"Query cache hit ({len(results)} docs) for: '{query_text}'")
+            return results
 
-        results = []
-        seen_sources = set()
-        for idx in indices[0]:
-            if idx < len(self.metadata):
-                doc = self.metadata[idx].copy()
-                src = doc["source"]
-                if src in seen_sources:
-                    continue
-                seen_sources.add(src)
-                doc["snippet"] = doc["text"][:500] + ("..." if len(doc["text"]) > 500 else "")
-                results.append(doc)
+        query_emb = self._prep_embeddings(
+            self.model.encode([query_text], convert_to_numpy=True)
+        )
+        distances, indices = self._search(query_emb, top_k)
 
+        results = self._collect_results(indices[0])
+        self._query_cache[cache_key] = [r["source"] for r in results]
+        while len(self._query_cache) > self._query_cache_max:
+            self._query_cache.popitem(last=False)
         logging.info(f"Retrieved {len(results)} docs for query: '{query_text}'")
         return results
+
+    def query_batch(self, query_texts: List[str], top_k: int = 3) -> List[List[Dict[str, str]]]:
+        """
+        Retrieve top_k relevant documents for each of several queries.
+
+        Encoding all queries in one model call and issuing a single FAISS
+        search lets FAISS parallelize across the batch (OpenMP + batched
+        BLAS), which beats calling query() once per text.
+        """
+        self._load_model()
+
+        if self.index is None or self.num_docs == 0:
+            raise ValueError("FAISS index not built yet. Ingest documents first.")
+
+        top_k = max(1, min(int(top_k), self.num_docs))
+
+        query_embs = self._prep_embeddings(
+            self.model.encode(
+                query_texts, batch_size=64, show_progress_bar=False, convert_to_numpy=True
+            )
+        )
+        if self.use_gpu and faiss.get_num_gpus() > 0:
+            distances, indices = self._batch_search_index().search(query_embs, top_k)
+        else:
+            distances, indices = self._search(query_embs, top_k)
+
+        all_results = [self._collect_results(row) for row in indices]
+        logging.info(f"Retrieved results for {len(query_texts)} queries in one batch.")
+        return all_results
+
+    def _search(self, query_embs: np.ndarray, top_k: int):
+        """Run one search over the store, honoring search_backend.
+
+        The torch path is brute-force exact search — a dense GEMM over
+        every stored vector — so it is only attempted below 100k docs,
+        where it outruns FAISS's flat kernels; anything larger (or any
+        torch/reconstruct hiccup) falls through to FAISS.
+
+        It also requires ntotal == num_docs: once a re-ingest has removed
+        ids, reconstruct_n would hit a hole (FAISS aborts the process
+        rather than raising from inside its OpenMP region) and matrix
+        positions would no longer equal IDMap ids, so hits would map to
+        the wrong metadata rows. With no removals, ids are 0..n-1 in
+        insertion order and positions and ids coincide.
+        """
+        if (
+            self.search_backend == "torch"
+            and torch is not None
+            and self.num_docs < 100_000
+            and self.index.ntotal == self.num_docs
+        ):
+            try:
+                return self._torch_search(query_embs, top_k)
+            except Exception as e:
+                logging.error(f"torch search failed ({e}), falling back to FAISS.")
+        # The HNSW index may sit behind the IDMap2 wrapper; downcast to
+        # reach the efSearch knob either way.
+        base = self.index
+        if isinstance(base, faiss.IndexIDMap2):
+            base = faiss.downcast_index(base.index)
+        if isinstance(base, faiss.IndexHNSWFlat):
+            base.hnsw.efSearch = self.ef_search
+        return self.index.search(query_embs, top_k)
+
+    def _torch_search(self, query_embs: np.ndarray, top_k: int):
+        """Exact inner-product search via torch.mm + torch.topk."""
+        if self._emb_mat is None or self._emb_mat.shape[0] != self.index.ntotal:
+            # Pull the stored vectors back out of the index once; adds
+            # invalidate this so it tracks the corpus.
+            self._emb_mat = torch.from_numpy(
+                self.index.reconstruct_n(0, self.index.ntotal)
+            ).contiguous()
+        with torch.inference_mode():
+            scores = torch.mm(torch.from_numpy(query_embs), self._emb_mat.T)
+            vals, idx = torch.topk(scores, min(top_k, self._emb_mat.shape[0]), dim=1)
+        return vals.numpy(), idx.numpy()
+
+    def _batch_search_index(self) -> faiss.Index:
+        """The index to use for batched searches: a GPU clone if enabled
+        and available, otherwise the CPU index."""
+        if self.use_gpu and faiss.get_num_gpus() > 0:
+            if self._gpu_index is None:
+                # Not every index type clones to GPU (HNSW in particular,
+                # which "auto" builds for mid-sized corpora); degrade to
+                # CPU search like the other fallback paths here.
+                try:
+                    if self._gpu_res is None:
+                        self._gpu_res = faiss.StandardGpuResources()
+                    self._gpu_index = faiss.index_cpu_to_gpu(self._gpu_res, 0, self.index)
+                except Exception as e:
+                    logging.error(f"GPU index clone failed ({e}), searching on CPU.")
+                    return self.index
+            return self._gpu_index
+        return self.index
+
+    def _remove_stale(self, stale, texts, new_metadata):
+        """Drop re-ingested sources' old vectors from the index.
+
+        Requires an IDMap2-wrapped index (ids survive removal); where the
+        index can't remove (older plain indexes, HNSW bases), the
+        affected files are skipped instead so the index never holds two
+        vectors for one source.
+        """
+        removed = False
+        if isinstance(self.index, faiss.IndexIDMap2):
+            if self._index_mmapped:
+                self.index = faiss.read_index(self.index_path)
+                self._index_mmapped = False
+            try:
+                ids = np.asarray([row for _, row in stale], dtype=np.int64)
+                self.index.remove_ids(faiss.IDSelectorBatch(ids))
+                removed = True
+            except RuntimeError as e:
+                logging.error(f"Index removal failed ({e}).")
+        if not removed:
+            skipped = {fname for fname, _ in stale}
+            logging.warning(
+                f"Index type does not support removal; skipping re-ingest of "
+                f"{len(skipped)} existing file(s)."
+            )
+            keep = [i for i, m in enumerate(new_metadata) if m["source"] not in skipped]
+            texts = [texts[i] for i in keep]
+            new_metadata = [new_metadata[i] for i in keep]
+        return texts, new_metadata
+
+    def _collect_results(self, idx_row) -> List[Dict[str, str]]:
+        """Map one row of search ids straight to result dicts.
+
+        Sources are unique in the index (old vectors are removed at
+        write time) and snippets are precomputed at ingest, so there is
+        no per-hit dedup or string slicing left on the query path.
+        """
+        results = []
+        sources = self._meta.column("source")
+        snippets = self._meta.column("snippet")
+        file_types = self._meta.column("file_type")
+        ingested = self._meta.column("ingested_at")
+        for idx in idx_row:
+            idx = int(idx)
+            if 0 <= idx < self.num_docs:
+                results.append({
+                    "source": sources[idx].as_py(),
+                    "file_type": file_types[idx].as_py(),
+                    "ingested_at": ingested[idx].as_py(),
+                    "snippet": snippets[idx].as_py(),
+                })
+        return results